@@ -4,13 +4,22 @@ from datetime import date, datetime
 from pathlib import Path
 from io import BytesIO
 import uuid
+import hashlib
+import os
+import tempfile
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 from streamlit_sortables import sort_items  # pip install streamlit-sortables
 
+try:
+    import orjson  # pip install orjson (opcional, bem mais rápido que o json padrão)
+except ImportError:
+    orjson = None
+
 from reportlab.lib.pagesizes import A4, landscape
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
 
@@ -21,7 +30,7 @@ MESES_PT = {
     7: "Julho", 8: "Agosto", 9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
 }
 
-STATUSES = [
+STATUSES = (
     "Atendimento 08:00-14:00",
     "Atendimento 12:00-18:00",
     "Laboratório",
@@ -29,9 +38,11 @@ STATUSES = [
     "Blip 12:00-18:00",
     "Banco de horas",
     "Férias",
-]
+)
 DEFAULT_STATUS = "Atendimento 08:00-14:00"
 HEADERS = {stt: stt for stt in STATUSES}
+HEADER_TO_STATUS = {HEADERS[stt]: stt for stt in STATUSES}
+STATUS_SET = frozenset(STATUSES)
 
 META_CLOSED_KEY = "__closed__"  # sábado feriado/fechado (ninguém trabalha)
 
@@ -48,79 +59,135 @@ CONFIG_EXPORT_VERSION = 3
 
 
 
+def json_dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def json_loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
 def load_json(path: Path, default):
     try:
         if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return json_loads(path.read_bytes())
     except Exception:
         pass
     return default
 
 
-def save_json(path: Path, data):
+def content_hash(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def save_json_if_changed(path: Path, data):
+    # só grava em disco quando o conteúdo mudou desde a última gravação nesta sessão
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        blob = json_dumps(data)
+        h = content_hash(blob)
+        hash_key = f"__hash_{path}"
+        if st.session_state.get(hash_key) == h:
+            return
+        path.write_bytes(blob)
+        st.session_state[hash_key] = h
     except Exception:
         pass
 
 
-
-def get_saturdays(year: int, month: int):
+def save_json_files_atomic(files: dict[Path, object]):
+    # serializa e grava tudo em temporários primeiro e só então troca os arquivos. A troca é
+    # atômica por arquivo (os.replace): uma falha na serialização ou gravação dos temporários
+    # não altera nada, mas uma falha num os.replace posterior deixa os anteriores já trocados
+    blobs = {path: json_dumps(data) for path, data in files.items()}
+    tmp_paths = {}
+    try:
+        for path, blob in blobs.items():
+            with tempfile.NamedTemporaryFile("wb", dir=path.parent, prefix=f".{path.name}.", delete=False) as f:
+                tmp_paths[path] = Path(f.name)
+                f.write(blob)
+            # NamedTemporaryFile cria com 0600; mantém a permissão do arquivo original
+            try:
+                mode = path.stat().st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o644
+            os.chmod(tmp_paths[path], mode)
+        for path, tmp in tmp_paths.items():
+            os.replace(tmp, path)
+            st.session_state[f"__hash_{path}"] = content_hash(blobs[path])
+    finally:
+        for tmp in tmp_paths.values():
+            if tmp.exists():
+                tmp.unlink()
+
+
+
+# cache_resource sobrevive aos reruns (o Streamlit reexecuta o script num módulo novo a cada rerun,
+# então um lru_cache aqui seria recriado toda vez) e devolve o mesmo objeto sem copiar; é seguro
+# porque o retorno é uma tupla imutável de datas
+@st.cache_resource(max_entries=256, show_spinner=False)
+def get_saturdays(year: int, month: int) -> tuple[date, ...]:
     last_day = calendar.monthrange(year, month)[1]
     out = []
     for d in range(1, last_day + 1):
         dt = date(year, month, d)
         if dt.weekday() == 5:  # sábado
             out.append(dt)
-    return out
+    return tuple(out)
 
 
 def iso(d: date) -> str:
     return d.isoformat()
 
 
+def br_date(d: date) -> str:
+    # dd/mm/aaaa sem passar pelo strftime (mais barato no loop de renderização)
+    return f"{d.day:02d}/{d.month:02d}/{d.year}"
+
+
 
 def ensure_month_schedule(schedule: dict, year: int, month: int, people: list[str]) -> dict:
     month_key = f"{year:04d}-{month:02d}"
     if month_key not in schedule:
         schedule[month_key] = {}
 
-    sats = get_saturdays(year, month)
-    sats_iso = [iso(d) for d in sats]
+    people_set = set(people)
+    month_map = schedule[month_key]
+
+    sats_iso = [iso(d) for d in get_saturdays(year, month)]
+    sats_set = set(sats_iso)
 
     # remove sábados que não existem mais
-    for k in list(schedule[month_key].keys()):
-        if k not in sats_iso:
-            schedule[month_key].pop(k, None)
+    for k in [k for k in month_map if k not in sats_set]:
+        month_map.pop(k, None)
 
     # garante todos sábados existentes com todos os status + meta
     for s in sats_iso:
-        if s not in schedule[month_key]:
-            schedule[month_key][s] = {stt: [] for stt in STATUSES}
-            schedule[month_key][s][META_CLOSED_KEY] = False
-            schedule[month_key][s][DEFAULT_STATUS] = list(people)
-        else:
-            if META_CLOSED_KEY not in schedule[month_key][s]:
-                schedule[month_key][s][META_CLOSED_KEY] = False
+        day_map = month_map.get(s)
+        if day_map is None:
+            day_map = month_map[s] = {stt: [] for stt in STATUSES}
+            day_map[META_CLOSED_KEY] = False
+            day_map[DEFAULT_STATUS] = list(people)
+            continue
 
-            for stt in STATUSES:
-                schedule[month_key][s].setdefault(stt, [])
+        day_map.setdefault(META_CLOSED_KEY, False)
 
-            if schedule[month_key][s].get(META_CLOSED_KEY) is True:
-                for stt in STATUSES:
-                    schedule[month_key][s][stt] = [p for p in schedule[month_key][s][stt] if p in people]
-                continue
+        assigned_set = set()
+        for stt in STATUSES:
+            # filtra por set e remove duplicados preservando a ordem
+            filtered = list(dict.fromkeys(p for p in day_map.get(stt, []) if p in people_set))
+            day_map[stt] = filtered
+            assigned_set.update(filtered)
 
-            assigned = []
-            for stt in STATUSES:
-                schedule[month_key][s][stt] = [p for p in schedule[month_key][s][stt] if p in people]
-                assigned.extend(schedule[month_key][s][stt])
+        if day_map.get(META_CLOSED_KEY) is True:
+            continue
 
-            missing = [p for p in people if p not in set(assigned)]
-            if missing:
-                schedule[month_key][s][DEFAULT_STATUS].extend(missing)
+        missing = [p for p in people if p not in assigned_set]
+        if missing:
+            day_map[DEFAULT_STATUS].extend(missing)
 
     return schedule
 
@@ -131,6 +198,19 @@ def get_month_schedule(schedule: dict, year: int, month: int) -> dict:
 
 
 def sanitize_day(day_map: dict, people: list[str]) -> dict:
+    people_set = set(people)
+
+    # caminho rápido: dia já válido (todos os status presentes, cada colaborador exatamente uma vez)
+    if META_CLOSED_KEY in day_map and day_map.keys() >= STATUS_SET:
+        lists = [day_map[stt] for stt in STATUSES]
+        if day_map[META_CLOSED_KEY] is True:
+            if not any(lists):
+                return day_map
+        else:
+            assigned = set().union(*lists)
+            if assigned == people_set and sum(map(len, lists)) == len(assigned):
+                return day_map
+
     day_map.setdefault(META_CLOSED_KEY, False)
 
     for stt in STATUSES:
@@ -145,7 +225,7 @@ def sanitize_day(day_map: dict, people: list[str]) -> dict:
     for stt in STATUSES:
         new_list = []
         for n in day_map[stt]:
-            if n in people and n not in seen:
+            if n in people_set and n not in seen:
                 new_list.append(n)
                 seen.add(n)
         day_map[stt] = new_list
@@ -162,13 +242,12 @@ def day_map_to_sortables(day_map: dict) -> list[dict]:
 
 
 def sortables_to_day_map(sorted_items: list[dict]) -> dict:
-    header_to_status = {HEADERS[stt]: stt for stt in STATUSES}
     out = {stt: [] for stt in STATUSES}
 
     for col in sorted_items:
         header = col.get("header")
         items = col.get("items", [])
-        stt = header_to_status.get(header)
+        stt = HEADER_TO_STATUS.get(header)
         if stt:
             out[stt] = [x for x in items if isinstance(x, str) and x.strip()]
 
@@ -176,29 +255,30 @@ def sortables_to_day_map(sorted_items: list[dict]) -> dict:
 
 
 
-def build_month_summary(month_schedule: dict, saturdays: list[date], people: list[str]) -> pd.DataFrame:
-    counts = {p: {stt: 0 for stt in STATUSES} for p in people}
+def build_month_summary(month_schedule: dict, saturdays: tuple[date, ...], people: list[str]) -> pd.DataFrame:
+    people = list(dict.fromkeys(people))
+    counts = {p: [0] * len(STATUSES) for p in people}
 
     for sat in saturdays:
-        sat_iso = iso(sat)
-        day_map = month_schedule.get(sat_iso)
-        if not isinstance(day_map, dict):
-            continue
-
-        if day_map.get(META_CLOSED_KEY) is True:
+        day_map = month_schedule.get(iso(sat))
+        if not isinstance(day_map, dict) or day_map.get(META_CLOSED_KEY) is True:
             continue
 
-        for stt in STATUSES:
+        for i, stt in enumerate(STATUSES):
             for name in day_map.get(stt, []):
-                if name in counts:
-                    counts[name][stt] += 1
+                row = counts.get(name)
+                if row is not None:
+                    row[i] += 1
 
-    df = pd.DataFrame.from_dict(counts, orient="index")
+    df = pd.DataFrame(list(counts.values()), index=people, columns=list(STATUSES))
     df.index.name = "Colaborador"
     df = df.reset_index()
 
-    df["Total"] = df[STATUSES].sum(axis=1)
-    df = df.sort_values(["Total", "Colaborador"], ascending=[False, True]).drop(columns=["Total"])
+    df = (
+        df.assign(Total=df[list(STATUSES)].sum(axis=1))
+        .sort_values(["Total", "Colaborador"], ascending=[False, True])
+        .drop(columns=["Total"])
+    )
     return df
 
 
@@ -211,8 +291,8 @@ def ensure_considerations_struct(data: dict) -> dict:
 
 
 def get_month_considerations(cons_data: dict, month_key: str) -> list[dict]:
-    cons_data = ensure_considerations_struct(cons_data)
-    lst = cons_data["months"].get(month_key, [])
+    # cons_data já passou por ensure_considerations_struct na inicialização
+    lst = cons_data["months"].setdefault(month_key, [])
     if not isinstance(lst, list):
         lst = []
         cons_data["months"][month_key] = lst
@@ -220,56 +300,85 @@ def get_month_considerations(cons_data: dict, month_key: str) -> list[dict]:
 
 
 
-def _p(text: str, styles, style_name="Normal"):
-    return Paragraph(text, styles[style_name])
+def _make_doc(buf: BytesIO) -> BaseDocTemplate:
+    doc = BaseDocTemplate(buf, pagesize=landscape(A4), leftMargin=18, rightMargin=18, topMargin=18, bottomMargin=18)
+    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id="body")
+    doc.addPageTemplates([PageTemplate(id="page", frames=[frame])])
+    return doc
+
+
+# estilos do ReportLab: o script é reexecutado a cada rerun, então ficam num cache_resource
+# e só são montados quando um PDF precisa ser gerado (cache dos PDFs vazio)
+@st.cache_resource(show_spinner=False)
+def _pdf_styles() -> dict:
+    sheet = getSampleStyleSheet()
+    return {
+        "normal": sheet["Normal"],
+        "h2": sheet["Heading2"],
+        "title": sheet["Title"],
+        "summary_table": TableStyle([
+            ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+            ("FONTSIZE", (0, 0), (-1, -1), 8),
+            ("GRID", (0, 0), (-1, -1), 0.3, colors.grey),
+            ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("ALIGN", (1, 1), (-1, -1), "CENTER"),
+            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ]),
+        "schedule_table": TableStyle([
+            ("GRID", (0, 0), (-1, -1), 0.3, colors.grey),
+            ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
+            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+            ("FONTSIZE", (0, 0), (-1, 0), 9),
+            ("FONTSIZE", (0, 1), (-1, 1), 8),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ]),
+    }
+
+
+def _p(text: str, style):
+    return Paragraph(text, style)
 
 
-def _add_considerations_to_story(story, styles, considerations: list[dict]):
+def _add_considerations_to_story(story, styles: dict, considerations: list[dict]):
     story.append(Spacer(1, 10))
-    story.append(_p("<b>Considerações</b>", styles, "Heading2"))
+    story.append(_p("<b>Considerações</b>", styles["h2"]))
     story.append(Spacer(1, 6))
 
     if not considerations:
-        story.append(_p("— Nenhuma consideração cadastrada.", styles))
+        story.append(_p("— Nenhuma consideração cadastrada.", styles["normal"]))
         return
 
     for it in considerations:
         txt = (it.get("text") or "").strip()
         if txt:
-            story.append(_p(f"• {txt}", styles))
+            story.append(_p(f"• {txt}", styles["normal"]))
 
 
 def make_summary_pdf(summary_df: pd.DataFrame, year: int, month: int, n_people: int, considerations: list[dict]) -> bytes:
     buf = BytesIO()
-    doc = SimpleDocTemplate(buf, pagesize=landscape(A4), leftMargin=18, rightMargin=18, topMargin=18, bottomMargin=18)
-    styles = getSampleStyleSheet()
+    doc = _make_doc(buf)
+    styles = _pdf_styles()
     story = []
 
     title = f"Resumo do mês - {MESES_PT.get(month, str(month))}/{year}"
-    story.append(_p(title, styles, "Title"))
+    story.append(_p(title, styles["title"]))
     story.append(Spacer(1, 6))
-    story.append(_p(f"<b>Funcionários cadastrados:</b> {n_people}", styles))
+    story.append(_p(f"<b>Funcionários cadastrados:</b> {n_people}", styles["normal"]))
     story.append(Spacer(1, 10))
 
-    cols = ["Colaborador"] + STATUSES
-    data = [cols]
-    for _, r in summary_df.iterrows():
-        data.append([str(r["Colaborador"])] + [str(int(r[c])) for c in STATUSES])
+    cols = ["Colaborador", *STATUSES]
+    names = summary_df["Colaborador"].to_numpy()
+    counts = summary_df[list(STATUSES)].to_numpy(dtype=np.int32)
+    data = [cols] + [[str(n), *map(str, row)] for n, row in zip(names, counts.tolist())]
 
     page_w, _ = landscape(A4)
     usable_w = page_w - doc.leftMargin - doc.rightMargin
     col_widths = [150] + [(usable_w - 150) / len(STATUSES)] * len(STATUSES)
 
     table = Table(data, colWidths=col_widths, repeatRows=1)
-    table.setStyle(TableStyle([
-        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-        ("FONTSIZE", (0, 0), (-1, -1), 8),
-        ("GRID", (0, 0), (-1, -1), 0.3, colors.grey),
-        ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("ALIGN", (1, 1), (-1, -1), "CENTER"),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-    ]))
+    table.setStyle(styles["summary_table"])
     story.append(table)
 
     _add_considerations_to_story(story, styles, considerations)
@@ -278,16 +387,16 @@ def make_summary_pdf(summary_df: pd.DataFrame, year: int, month: int, n_people:
     return buf.getvalue()
 
 
-def make_schedule_pdf(month_schedule: dict, saturdays: list[date], year: int, month: int, n_people: int, considerations: list[dict]) -> bytes:
+def make_schedule_pdf(month_schedule: dict, saturdays: tuple[date, ...], year: int, month: int, n_people: int, considerations: list[dict]) -> bytes:
     buf = BytesIO()
-    doc = SimpleDocTemplate(buf, pagesize=landscape(A4), leftMargin=18, rightMargin=18, topMargin=18, bottomMargin=18)
-    styles = getSampleStyleSheet()
+    doc = _make_doc(buf)
+    styles = _pdf_styles()
     story = []
 
     title = f"Escala de Sábados - {MESES_PT.get(month, str(month))}/{year}"
-    story.append(_p(title, styles, "Title"))
+    story.append(_p(title, styles["title"]))
     story.append(Spacer(1, 6))
-    story.append(_p(f"<b>Funcionários cadastrados:</b> {n_people}", styles))
+    story.append(_p(f"<b>Funcionários cadastrados:</b> {n_people}", styles["normal"]))
     story.append(Spacer(1, 10))
 
     page_w, _ = landscape(A4)
@@ -299,11 +408,11 @@ def make_schedule_pdf(month_schedule: dict, saturdays: list[date], year: int, mo
         day_map = month_schedule.get(sat_iso, {stt: [] for stt in STATUSES})
         is_closed = bool(day_map.get(META_CLOSED_KEY))
 
-        story.append(_p(f"<b>{sat.strftime('%d/%m/%Y')}</b>", styles, "Heading2"))
+        story.append(_p(f"<b>{br_date(sat)}</b>", styles["h2"]))
         story.append(Spacer(1, 6))
 
         if is_closed:
-            story.append(_p("<b>FERIADO / SEM ESCALA (ninguém trabalha)</b>", styles))
+            story.append(_p("<b>FERIADO / SEM ESCALA (ninguém trabalha)</b>", styles["normal"]))
             story.append(Spacer(1, 10))
         else:
             header_row = [HEADERS[stt] for stt in STATUSES]
@@ -314,18 +423,10 @@ def make_schedule_pdf(month_schedule: dict, saturdays: list[date], year: int, mo
                     html = "<br/>".join([f"• {n}" for n in names])
                 else:
                     html = "-"
-                values_row.append(_p(html, styles))
+                values_row.append(_p(html, styles["normal"]))
 
             table = Table([header_row, values_row], colWidths=col_widths)
-            table.setStyle(TableStyle([
-                ("GRID", (0, 0), (-1, -1), 0.3, colors.grey),
-                ("BACKGROUND", (0, 0), (-1, 0), colors.whitesmoke),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, 0), 9),
-                ("FONTSIZE", (0, 1), (-1, 1), 8),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-            ]))
+            table.setStyle(styles["schedule_table"])
             story.append(table)
 
         if i % 2 == 1 and i != len(saturdays) - 1:
@@ -339,6 +440,22 @@ def make_schedule_pdf(month_schedule: dict, saturdays: list[date], year: int, mo
     return buf.getvalue()
 
 
+# O PDF só é reconstruído quando o conteúdo muda (o hash é a chave do cache; o payload,
+# prefixado com "_", não é re-hasheado pelo Streamlit).
+@st.cache_data(max_entries=8, show_spinner=False)
+def cached_schedule_pdf(schedule_hash: bytes, _payload: bytes) -> bytes:
+    d = json_loads(_payload)
+    saturdays = tuple(date.fromisoformat(s) for s in d["sats"])
+    return make_schedule_pdf(d["ms"], saturdays, d["y"], d["m"], d["n"], d["cons"])
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def cached_summary_pdf(summary_hash: bytes, _payload: bytes) -> bytes:
+    d = json_loads(_payload)
+    summary_df = pd.DataFrame(d["rows"], columns=d["cols"])
+    return make_summary_pdf(summary_df, d["y"], d["m"], d["n"], d["cons"])
+
+
 def build_export_package(people: list[str], schedule_months: dict, considerations_months: dict) -> dict:
     return {
         "type": "intelbras_sabados_config",
@@ -374,12 +491,7 @@ def validate_import_package(pkg: dict) -> tuple[bool, str]:
 
 def apply_import_package(pkg: dict):
     people = [x.strip() for x in pkg.get("employees", []) if isinstance(x, str) and x.strip()]
-    seen = set()
-    people_clean = []
-    for p in people:
-        if p not in seen:
-            people_clean.append(p)
-            seen.add(p)
+    people_clean = list(dict.fromkeys(people))
 
     months = pkg.get("months", {})
     if not isinstance(months, dict):
@@ -389,12 +501,15 @@ def apply_import_package(pkg: dict):
     if not isinstance(cons_months, dict):
         cons_months = {}
 
-    save_json(EMPLOYEES_JSON, {"employees": people_clean})
-    save_json(SCHEDULE_JSON, {"months": months})
-    save_json(CONSIDERATIONS_JSON, {"months": cons_months})
+    save_json_files_atomic({
+        EMPLOYEES_JSON: {"employees": people_clean},
+        SCHEDULE_JSON: {"months": months},
+        CONSIDERATIONS_JSON: {"months": cons_months},
+    })
 
     st.session_state.people = people_clean
     st.session_state.schedule = months
+    st.session_state.pop("__sched_fp", None)
     st.session_state.considerations = {"months": cons_months}
 
 
@@ -575,7 +690,7 @@ with st.sidebar:
         p = new_person.strip()
         if p and p not in st.session_state.people:
             st.session_state.people.append(p)
-            save_json(EMPLOYEES_JSON, {"employees": st.session_state.people})
+            save_json_if_changed(EMPLOYEES_JSON, {"employees": st.session_state.people})
             st.success(f"Adicionado: {p}")
         elif not p:
             st.warning("Nome vazio.")
@@ -587,7 +702,7 @@ with st.sidebar:
         if st.button("Remover", use_container_width=True):
             if rem != "(nenhum)":
                 st.session_state.people = [x for x in st.session_state.people if x != rem]
-                save_json(EMPLOYEES_JSON, {"employees": st.session_state.people})
+                save_json_if_changed(EMPLOYEES_JSON, {"employees": st.session_state.people})
                 st.success(f"Removido: {rem}")
 
     st.caption("Dica: ao mudar o mês, todos começam em Atendimento 08:00-14:00 em cada sábado.")
@@ -598,9 +713,9 @@ with st.sidebar:
     export_pkg = build_export_package(
         st.session_state.people,
         st.session_state.schedule,
-        ensure_considerations_struct(st.session_state.considerations).get("months", {})
+        st.session_state.considerations["months"]
     )
-    export_bytes = json.dumps(export_pkg, ensure_ascii=False, indent=2).encode("utf-8")
+    export_bytes = json_dumps(export_pkg)
 
     st.download_button(
         "Baixar Configurações do sistema",
@@ -613,7 +728,7 @@ with st.sidebar:
     uploaded = st.file_uploader("Importar Configuração (JSON)", type=["json"])
     if uploaded is not None:
         try:
-            pkg = json.loads(uploaded.read().decode("utf-8"))
+            pkg = json_loads(uploaded.read())
             ok, msg = validate_import_package(pkg)
             if not ok:
                 st.error(msg)
@@ -635,13 +750,17 @@ st.session_state.active_month = month_i
 month_key = f"{year_i:04d}-{month_i:02d}"
 
 
-st.session_state.schedule = ensure_month_schedule(
-    st.session_state.schedule,
-    year_i,
-    month_i,
-    st.session_state.people
-)
-save_json(SCHEDULE_JSON, {"months": st.session_state.schedule})
+# só revalida o mês quando ano/mês/colaboradores mudam (ou o mês ainda não existe)
+sched_fp = (year_i, month_i, tuple(st.session_state.people))
+if st.session_state.get("__sched_fp") != sched_fp or month_key not in st.session_state.schedule:
+    st.session_state.schedule = ensure_month_schedule(
+        st.session_state.schedule,
+        year_i,
+        month_i,
+        st.session_state.people
+    )
+    st.session_state["__sched_fp"] = sched_fp
+    save_json_if_changed(SCHEDULE_JSON, {"months": st.session_state.schedule})
 
 month_schedule = get_month_schedule(st.session_state.schedule, year_i, month_i)
 saturdays = get_saturdays(year_i, month_i)
@@ -659,10 +778,6 @@ if not st.session_state.people:
     st.stop()
 
 # consideraçoes do mês
-st.session_state.considerations = ensure_considerations_struct(st.session_state.considerations)
-_ = get_month_considerations(st.session_state.considerations, month_key)
-save_json(CONSIDERATIONS_JSON, st.session_state.considerations)
-
 current_considerations = get_month_considerations(st.session_state.considerations, month_key)
 
 
@@ -684,7 +799,7 @@ for col, sat_date in zip(cols, saturdays):
         day_map = sanitize_day(day_map, st.session_state.people)
 
         st.markdown('<div class="sat-card">', unsafe_allow_html=True)
-        st.markdown(f'<div class="block-title">{sat_date.strftime("%d/%m/%Y")}</div>', unsafe_allow_html=True)
+        st.markdown(f'<div class="block-title">{br_date(sat_date)}</div>', unsafe_allow_html=True)
 
         closed_key = f"{sat_iso}-closed"
         is_closed_now = bool(day_map.get(META_CLOSED_KEY))
@@ -716,11 +831,19 @@ for col, sat_date in zip(cols, saturdays):
 
 # salva
 st.session_state.schedule[month_key] = month_schedule
-save_json(SCHEDULE_JSON, {"months": st.session_state.schedule})
+save_json_if_changed(SCHEDULE_JSON, {"months": st.session_state.schedule})
 st.success("Alterações salvas automaticamente em data/schedule_sabados.json")
 
 # botão PDF da escala (logo abaixo)
-pdf_escala = make_schedule_pdf(month_schedule, saturdays, year_i, month_i, n_people, current_considerations)
+schedule_payload = json_dumps({
+    "ms": month_schedule,
+    "sats": [iso(s) for s in saturdays],
+    "cons": current_considerations,
+    "y": year_i,
+    "m": month_i,
+    "n": n_people,
+})
+pdf_escala = cached_schedule_pdf(content_hash(schedule_payload), schedule_payload)
 st.download_button(
     "Exportar PDF da Escala",
     data=pdf_escala,
@@ -735,7 +858,15 @@ st.markdown("## Resumo do mês (quantidade por status)")
 summary_df = build_month_summary(month_schedule, saturdays, st.session_state.people)
 st.dataframe(summary_df, use_container_width=True, hide_index=True)
 
-pdf_resumo = make_summary_pdf(summary_df, year_i, month_i, n_people, current_considerations)
+summary_payload = json_dumps({
+    "cols": list(summary_df.columns),
+    "rows": summary_df.to_numpy().tolist(),
+    "cons": current_considerations,
+    "y": year_i,
+    "m": month_i,
+    "n": n_people,
+})
+pdf_resumo = cached_summary_pdf(content_hash(summary_payload), summary_payload)
 csv_bytes = summary_df.to_csv(index=False).encode("utf-8-sig")
 
 b1, b2 = st.columns(2)
@@ -772,7 +903,7 @@ if submitted:
     else:
         item = {"id": str(uuid.uuid4()), "text": txt, "created_at": datetime.now().isoformat(timespec="seconds")}
         st.session_state.considerations["months"][month_key].append(item)
-        save_json(CONSIDERATIONS_JSON, st.session_state.considerations)
+        save_json_if_changed(CONSIDERATIONS_JSON, st.session_state.considerations)
         st.rerun()
 
 st.markdown("**Considerações feitas:**")
@@ -781,17 +912,21 @@ items = st.session_state.considerations["months"].get(month_key, [])
 if not items:
     st.caption("Nenhuma consideração cadastrada neste mês.")
 else:
-    for it in items:
-        row1, row2 = st.columns([6, 1])
-        with row1:
-            st.markdown(f"• {it.get('text','')}")
-        with row2:
-            if st.button("Remover", key=f"rm-{it['id']}"):
-                st.session_state.considerations["months"][month_key] = [
-                    x for x in st.session_state.considerations["months"][month_key]
-                    if x.get("id") != it["id"]
-                ]
-                save_json(CONSIDERATIONS_JSON, st.session_state.considerations)
-                st.rerun()
+    st.markdown("\n".join(f"- {it.get('text','')}" for it in items))
+
+    text_by_id = {it["id"]: it.get("text", "") for it in items}
+    to_remove = st.multiselect(
+        "Remover considerações",
+        options=list(text_by_id),
+        format_func=text_by_id.get,
+        key=f"rm-cons-{month_key}",
+    )
+    if st.button("Remover selecionadas", disabled=not to_remove):
+        remove_ids = set(to_remove)
+        st.session_state.considerations["months"][month_key] = [
+            x for x in items if x.get("id") not in remove_ids
+        ]
+        save_json_if_changed(CONSIDERATIONS_JSON, st.session_state.considerations)
+        st.rerun()
 
 # streamlit run .\intelbras-t9.py